@@ -1,4 +1,5 @@
 # D:\Hackathon\api\server.py
+import binascii
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 
@@ -6,6 +7,7 @@ from backend.service import (
     check_text_service,
     check_account_service,
     check_username_service,
+    assess_account_service,
 )
 
 app = Flask(__name__)
@@ -34,6 +36,27 @@ def api_check_username():
     result = check_username_service(username)
     return jsonify(result), 200
 
+@app.post("/api/assess-account")
+def api_assess_account():
+    """
+    JSON body: {"username", "features": {...}, "avatar": base64, "vip_avatar": base64,
+    "posts": [...], "deadline_ms": 2000}. Signals not done by the deadline are
+    listed in "missing" and the risk score is computed from the rest.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        result = assess_account_service(
+            data.get("username", ""),
+            features=data.get("features"),
+            avatar_b64=data.get("avatar"),
+            posts=data.get("posts"),
+            vip_avatar_b64=data.get("vip_avatar"),
+            deadline_ms=data.get("deadline_ms", 2000),
+        )
+    except (binascii.Error, TypeError, ValueError) as e:
+        return jsonify({"error": f"invalid request: {e}"}), 400
+    return jsonify(result), 200
+
 if __name__ == "__main__":
     # Debug=True for development. Change host/port if you want externally accessible.
     app.run(host="127.0.0.1", port=5000, debug=True)
@@ -1,11 +1,14 @@
 import pandas as pd
+import joblib
 import os
+from backend.roster import load_roster
 
 class AccountVerifier:
     def __init__(self, vip_dataset="data/real_vip_accounts.csv"):
         if not os.path.exists(vip_dataset):
             raise FileNotFoundError(f"VIP dataset not found: {vip_dataset}")
-        self.vip_df = pd.read_csv(vip_dataset)
+        # shared memory-mapped roster instead of a per-process DataFrame
+        self.roster = load_roster(vip_dataset)
 
     def verify(self, account_dict, id_column="Name"):
         """
@@ -13,14 +16,37 @@ class AccountVerifier:
         - If yes → Real
         - If no → Fake
         """
-        if id_column not in self.vip_df.columns:
+        if id_column not in self.roster.columns:
             raise ValueError(f"VIP dataset must contain column '{id_column}'")
 
         account_name = account_dict.get(id_column, None)
         if account_name is None:
             return {"is_fake": True, "reason": f"No {id_column} provided"}
 
-        if account_name in self.vip_df[id_column].values:
+        if self.roster.contains(id_column, account_name):
             return {"is_fake": False, "reason": "Verified VIP account"}
         else:
             return {"is_fake": True, "reason": "Not An Official Account"}
+
+
+class FakeAccountModel:
+    features = ["followers_count", "following_count", "account_age_days",
+                "post_count", "has_profile_pic", "has_bio"]
+
+    def __init__(self,
+                 scaler_path="models/fake_scaler.joblib",
+                 clf_path="models/fake_model.joblib"):
+        if not os.path.exists(scaler_path) or not os.path.exists(clf_path):
+            raise FileNotFoundError(f"Fake account model files missing. Expected: {scaler_path}, {clf_path}")
+        self.scaler = joblib.load(scaler_path)
+        self.clf = joblib.load(clf_path)
+
+    def predict(self, feature_dict, threshold: float = 0.5):
+        """
+        Scores an account from its profile features (see `features`).
+        Missing features are treated as 0.
+        """
+        row = {f: float(feature_dict.get(f, 0) or 0) for f in self.features}
+        Xs = self.scaler.transform(pd.DataFrame([row], columns=self.features))
+        prob = float(self.clf.predict_proba(Xs)[0, 1])
+        return {"is_fake": bool(prob >= threshold), "probability": prob}
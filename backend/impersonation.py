@@ -5,13 +5,20 @@ import os
 
 class ImpersonationDetector:
     def __init__(self, official_usernames=None, max_distance=5):
-        self.official_usernames = official_usernames or []
+        # a list of names, or a VIPRoster whose names are read lazily from its mmap
+        self.official_usernames = official_usernames if official_usernames is not None else []
         self.max_distance = max_distance
 
+    def _official(self):
+        names = self.official_usernames
+        if hasattr(names, "iter_lower_names"):
+            return names.iter_lower_names()
+        return names
+
     def check_username(self, candidate: str, threshold: float = 0.3):
         candidate = (candidate or "").lower()
         scores = []
-        for vip in self.official_usernames:
+        for vip in self._official():
             vip_l = (vip or "").lower()
             if len(vip_l) == 0:
                 continue
@@ -25,9 +32,11 @@ class ImpersonationDetector:
         flag = best[1] >= (1 - threshold)
         return {"closest_match": best, "is_impersonation": flag}
 
-    def check_profile_pic(self, vip_img_path: str, sus_img_path: str):
-        if not os.path.exists(vip_img_path) or not os.path.exists(sus_img_path):
-            raise FileNotFoundError("profile image(s) not found")
+    def check_profile_pic(self, vip_img_path, sus_img_path):
+        # accepts file paths or file-like objects (e.g. uploaded bytes)
+        for img in (vip_img_path, sus_img_path):
+            if isinstance(img, str) and not os.path.exists(img):
+                raise FileNotFoundError("profile image(s) not found")
         h1 = imagehash.phash(Image.open(vip_img_path))
         h2 = imagehash.phash(Image.open(sus_img_path))
         dist = int(h1 - h2)
@@ -0,0 +1,755 @@
+import os
+import re
+import sys
+import json
+import shutil
+import argparse
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+
+BASE_DIR = os.path.join(os.path.dirname(__file__), "..")
+LOG_PATH = os.path.join(BASE_DIR, "logs", "detections.log")
+INDEX_DIR = os.path.join(BASE_DIR, "logs", "index")
+
+MINUTE_US = 60 * 1_000_000
+HOUR_US = 60 * MINUTE_US
+DAY_US = 24 * HOUR_US
+MAX_TS_US = 253402300800 * 1_000_000   # year 10000
+CHECKPOINT_BYTES = 64 << 20   # persist progress at least every 64 MB of log
+MAX_CATEGORIES = 1024         # further distinct categories are folded into OTHER
+OTHER = "<other>"
+NO_VIP = -1
+UNKNOWN = -1
+
+# column name -> array typecode (one file per column per hourly partition)
+COLUMNS = {
+    "ts": "q",        # event time, microseconds since epoch (UTC)
+    "cat": "h",       # category code
+    "vip": "i",       # matched VIP code, -1 when none
+    "verdict": "b",   # 1 flagged, 0 clean, -1 unknown
+    "pos": "q",       # byte offset of the record in the log
+}
+
+VERDICT_KEYS = ("is_threat", "is_fake", "is_impersonation")
+
+# Rollup files are int64 arrays: the number of rows they cover, the length of
+# each section, then each section as flat sorted tuples. The leading field of
+# every tuple is the bisect key.
+#   <hour>/rollup.bin   (vip, cat, verdict, n), (vip, minute, cat, verdict, n),
+#                       (minute, cat, verdict, n)
+#   days/<day>.bin      (vip, cat, verdict, n)
+#   summary.bin         (day, cat, verdict, n), (hour, cat, verdict, n)
+HOUR_SECTIONS = (4, 5, 4)
+DAY_SECTIONS = (4,)
+SUMMARY_SECTIONS = (4, 4)
+PARTITION_NAME = re.compile(r"^\d{8}T\d{2}$")
+
+
+def to_us(value):
+    """Accepts a datetime, ISO-8601 string or epoch seconds and returns epoch microseconds."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value * 1_000_000)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1_000_000)
+
+
+def from_us(ts_us):
+    return datetime.fromtimestamp(ts_us / 1_000_000, tz=timezone.utc)
+
+
+def _verdict(result):
+    for key in VERDICT_KEYS:
+        if key in result:
+            return 1 if result[key] else 0
+    return UNKNOWN
+
+
+def _matched_vip(result):
+    """The closest official match of a username check, if any."""
+    match = result.get("closest_match")
+    if isinstance(match, (list, tuple)) and match and isinstance(match[0], str) and match[0]:
+        return match[0].lower()
+    return None
+
+
+def _parse(line):
+    """Returns (ts, category, vip name, verdict) or None for a malformed line."""
+    try:
+        record = json.loads(line)
+        if not isinstance(record, dict):
+            return None
+        ts = to_us(record["ts"])
+        if not 0 <= ts < MAX_TS_US:
+            return None
+        result = record.get("result")
+        inp = record.get("input")
+        result = result if isinstance(result, dict) else {}
+        inp = inp if isinstance(inp, dict) else {}
+        vip = _matched_vip(result)
+        name = inp.get("Name")
+        # only names that verified as official are indexed, so client input
+        # cannot grow the VIP table without bound
+        if vip is None and result.get("is_fake") is False and isinstance(name, str) and name:
+            vip = name.lower()
+        return ts, str(record.get("category", "")), vip, _verdict(result)
+    except (ValueError, KeyError, TypeError, AttributeError, OverflowError, OSError):
+        return None
+
+
+def _flatten(counts):
+    flat = array("q")
+    for key in sorted(counts):
+        flat.extend(key)
+        flat.append(counts[key])
+    return flat
+
+
+def _to_counts(flat, width):
+    return {tuple(flat[i:i + width - 1]): flat[i + width - 1] for i in range(0, len(flat), width)}
+
+
+def _add(counts, key, n=1):
+    counts[key] = counts.get(key, 0) + n
+
+
+def _write_sections(path, rows, sections):
+    flats = [_flatten(s) for s in sections]
+    header = array("q", [rows])
+    header.extend(len(s) for s in sections)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        header.tofile(f)
+        for flat in flats:
+            flat.tofile(f)
+    os.replace(tmp, path)
+    return flats
+
+
+def _read_sections(path, rows, widths, wanted):
+    """
+    Reads the wanted sections of a rollup file. Returns None when the file is
+    missing, short, or covers a different number of rows than committed.
+    """
+    if not os.path.exists(path):
+        return None
+    out = []
+    try:
+        with open(path, "rb") as f:
+            header = array("q")
+            header.fromfile(f, 1 + len(widths))
+            if header[0] != rows:
+                return None
+            pos = header.itemsize * len(header)
+            for i, width in enumerate(widths):
+                size = header[1 + i] * width
+                if i in wanted:
+                    f.seek(pos)
+                    flat = array("q")
+                    flat.fromfile(f, size)
+                    out.append(flat)
+                else:
+                    out.append(None)
+                pos += header.itemsize * size
+    except (EOFError, ValueError):   # short or corrupt file
+        return None
+    return out
+
+
+def _sum(flat, lo, hi, width, cat_at, codes):
+    """Sums n over tuples [lo, hi) whose category and verdict match."""
+    cat, verdict = codes.get("cat"), codes.get("verdict")
+    total = 0
+    for j in range(lo * width, hi * width, width):
+        if (cat is None or flat[j + cat_at] == cat) and (verdict is None or flat[j + cat_at + 1] == verdict):
+            total += flat[j + width - 1]
+    return total
+
+
+def _key_range(keys, lo_key, hi_key=None):
+    return bisect_left(keys, lo_key), bisect_right(keys, lo_key if hi_key is None else hi_key)
+
+
+def _minute_aligned(ts_us):
+    return ts_us is None or ts_us % MINUTE_US == 0
+
+
+class DetectionLogIndex:
+    """
+    Incremental columnar index over logs/detections.log.
+
+    Records are partitioned by hour; each partition stores one binary column
+    per field. Counts are rolled up at three levels: per minute and per hour
+    inside each partition, per day in days/, and per hour and day without the
+    VIP dimension in summary.bin. A query is split into whole days, whole
+    hours and partial hours, and each piece is answered from the coarsest
+    rollup that covers it. Raw columns are scanned only for bounds or buckets
+    finer than a minute. Only bytes appended since the last update() are read.
+    """
+
+    def __init__(self, log_path=LOG_PATH, index_dir=INDEX_DIR):
+        self.log_path = log_path
+        self.index_dir = index_dir
+        self.meta_path = os.path.join(index_dir, "meta.json")
+        self.summary_path = os.path.join(index_dir, "summary.bin")
+        self.days_dir = os.path.join(index_dir, "days")
+        self._load_meta()
+
+    # ---------- storage ----------
+    def _empty_meta(self):
+        return {"version": 3, "offset": 0, "categories": [], "vips": [], "partitions": {}}
+
+    def _load_meta(self):
+        self.meta = self._empty_meta()
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("version") == self.meta["version"]:
+                self.meta = meta
+            else:
+                self._drop_partitions()   # older layout, re-ingest from scratch
+        self._cat_codes = {c: i for i, c in enumerate(self.meta["categories"])}
+        self._vip_codes = {v: i for i, v in enumerate(self.meta["vips"])}
+        # partition hour -> committed row count
+        self._rows = {int(hour): rows for hour, rows in self.meta["partitions"].items()}
+        self._hours = sorted(self._rows)
+        self._day_rows = {}
+        for hour, rows in self._rows.items():
+            _add(self._day_rows, hour // 24, rows)
+        # read caches, filled on first use
+        self._rollups = {}    # hour -> [hour vip, minute vip, minute totals] (+ bisect keys)
+        self._days = {}       # day -> (flat, vip keys)
+        self._summary = None  # (day flat, day keys, hour flat, hour keys)
+        # counts being updated by the current ingest
+        self._dirty = {}        # hour -> (hour vip, minute vip, minute totals) dicts
+        self._dirty_days = {}   # day -> dict
+        self._dirty_summary = None
+
+    def _save_meta(self):
+        self.meta["categories"] = list(self._cat_codes)
+        self.meta["vips"] = list(self._vip_codes)
+        self.meta["partitions"] = {str(hour): rows for hour, rows in self._rows.items()}
+        os.makedirs(self.index_dir, exist_ok=True)
+        tmp = self.meta_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp, self.meta_path)
+
+    def _part_dir(self, hour):
+        return os.path.join(self.index_dir, from_us(hour * HOUR_US).strftime("%Y%m%dT%H"))
+
+    def _column_path(self, hour, name):
+        return os.path.join(self._part_dir(hour), name + ".bin")
+
+    def _day_path(self, day):
+        return os.path.join(self.days_dir, from_us(day * DAY_US).strftime("%Y%m%d") + ".bin")
+
+    def _read_column(self, hour, name):
+        col = array(COLUMNS[name])
+        with open(self._column_path(hour, name), "rb") as f:
+            col.fromfile(f, self._rows[hour])
+        return col
+
+    def _rollup(self, hour, minutes=False):
+        """
+        Returns [hour vip, hour vip keys, minute vip, minute vip keys, minute
+        totals, minute keys] for a partition. The minute sections are only read
+        from disk when minutes=True.
+        """
+        cached = self._rollups.get(hour)
+        if cached is not None and (not minutes or cached[2] is not None):
+            return cached
+        wanted = {0, 1, 2} if minutes else {0}
+        path = os.path.join(self._part_dir(hour), "rollup.bin")
+        sections = _read_sections(path, self._rows[hour], HOUR_SECTIONS, wanted)
+        if sections is None:
+            # missing, or written by an update that never committed: rebuild from columns
+            counts = ({}, {}, {})
+            cols = [self._read_column(hour, name) for name in ("ts", "cat", "vip", "verdict")]
+            _count_rows(counts, *cols)
+            self._write_rollup(hour, counts)
+            return self._rollups[hour]
+        hour_vip, minute_vip, minute_tot = sections
+        if cached is None:
+            cached = self._rollups[hour] = [hour_vip, hour_vip[0::4], None, None, None, None]
+        if minutes:
+            cached[2:] = [minute_vip, minute_vip[0::5], minute_tot, minute_tot[0::4]]
+        return cached
+
+    def _write_rollup(self, hour, counts):
+        path = os.path.join(self._part_dir(hour), "rollup.bin")
+        hour_vip, minute_vip, minute_tot = _write_sections(path, self._rows[hour], counts)
+        self._rollups[hour] = [hour_vip, hour_vip[0::4], minute_vip, minute_vip[0::5],
+                               minute_tot, minute_tot[0::4]]
+
+    def _day(self, day):
+        cached = self._days.get(day)
+        if cached is not None:
+            return cached
+        sections = _read_sections(self._day_path(day), self._day_rows[day], DAY_SECTIONS, {0})
+        if sections is None:
+            # rebuild from the day's hourly rollups
+            counts = {}
+            for hour in self._day_hours(day):
+                flat = self._rollup(hour)[0]
+                for j in range(0, len(flat), 4):
+                    _add(counts, tuple(flat[j:j + 3]), flat[j + 3])
+            self._write_day(day, counts)
+            return self._days[day]
+        flat = sections[0]
+        cached = self._days[day] = (flat, flat[0::4])
+        return cached
+
+    def _write_day(self, day, counts):
+        os.makedirs(self.days_dir, exist_ok=True)
+        flat, = _write_sections(self._day_path(day), self._day_rows[day], [counts])
+        self._days[day] = (flat, flat[0::4])
+
+    def _summary_view(self):
+        if self._summary is not None:
+            return self._summary
+        total = sum(self._rows.values())
+        sections = _read_sections(self.summary_path, total, SUMMARY_SECTIONS, {0, 1})
+        if sections is None:
+            # rebuild from every hourly rollup
+            day_counts, hour_counts = {}, {}
+            for hour in self._hours:
+                flat = self._rollup(hour)[0]
+                for j in range(0, len(flat), 4):
+                    c, d, n = flat[j + 1], flat[j + 2], flat[j + 3]
+                    _add(day_counts, (hour // 24, c, d), n)
+                    _add(hour_counts, (hour, c, d), n)
+            self._write_summary(day_counts, hour_counts)
+            return self._summary
+        day_flat, hour_flat = sections
+        self._summary = (day_flat, day_flat[0::4], hour_flat, hour_flat[0::4])
+        return self._summary
+
+    def _write_summary(self, day_counts, hour_counts):
+        os.makedirs(self.index_dir, exist_ok=True)
+        day_flat, hour_flat = _write_sections(
+            self.summary_path, sum(self._rows.values()), [day_counts, hour_counts])
+        self._summary = (day_flat, day_flat[0::4], hour_flat, hour_flat[0::4])
+
+    def _day_hours(self, day):
+        lo = bisect_left(self._hours, day * 24)
+        hi = bisect_left(self._hours, (day + 1) * 24)
+        return self._hours[lo:hi]
+
+    def _drop_partitions(self):
+        if not os.path.isdir(self.index_dir):
+            return
+        for entry in os.listdir(self.index_dir):
+            if PARTITION_NAME.match(entry):
+                shutil.rmtree(os.path.join(self.index_dir, entry))
+        if os.path.isdir(self.days_dir):
+            shutil.rmtree(self.days_dir)
+        if os.path.exists(self.summary_path):
+            os.remove(self.summary_path)
+
+    def reset(self):
+        """Drops every partition; the next update() re-ingests the whole log."""
+        self._drop_partitions()
+        if os.path.exists(self.meta_path):
+            os.remove(self.meta_path)
+        self._load_meta()
+
+    # ---------- ingestion ----------
+    def _code(self, table, value):
+        code = table.get(value)
+        if code is None:
+            code = table[value] = len(table)
+        return code
+
+    def _category_code(self, category):
+        if category not in self._cat_codes and len(self._cat_codes) >= MAX_CATEGORIES - 1:
+            category = OTHER
+        return self._code(self._cat_codes, category)
+
+    def _checkpoint(self, offset):
+        """Persists dirty rollups, then the offset and row counts that make them visible."""
+        for hour, counts in self._dirty.items():
+            self._write_rollup(hour, counts)
+        for day, counts in self._dirty_days.items():
+            self._write_day(day, counts)
+        if self._dirty_summary is not None:
+            self._write_summary(*self._dirty_summary)
+        self._dirty.clear()
+        self._dirty_days.clear()
+        self._dirty_summary = None
+        self.meta["offset"] = offset
+        self._save_meta()
+
+    def update(self, batch_size=1 << 20):
+        """Ingests records appended to the log since the last call. Returns the number of new rows."""
+        if not os.path.exists(self.log_path):
+            raise FileNotFoundError(f"Detection log not found: {self.log_path}")
+        size = os.path.getsize(self.log_path)
+        if size < self.meta["offset"]:
+            # log was truncated or rotated
+            self.reset()
+
+        offset = checkpoint = self.meta["offset"]
+        added = 0
+        with open(self.log_path, "rb") as log:
+            log.seek(offset)
+            while True:
+                chunk = log.read(batch_size)
+                if not chunk:
+                    break
+                end = chunk.rfind(b"\n")
+                if end < 0:
+                    if len(chunk) < batch_size:
+                        break  # trailing partial line, wait for the writer
+                    batch_size *= 2
+                    log.seek(offset)
+                    continue
+                added += self._ingest(chunk[:end + 1], offset)
+                offset += end + 1
+                log.seek(offset)
+                if offset - checkpoint >= CHECKPOINT_BYTES:
+                    self._checkpoint(offset)
+                    checkpoint = offset
+        if offset != self.meta["offset"] or self._dirty:
+            self._checkpoint(offset)
+        return added
+
+    def _ingest(self, data, base):
+        pending = {}
+        pos = base
+        for line in data.splitlines(keepends=True):
+            start, pos = pos, pos + len(line)
+            parsed = _parse(line)
+            if parsed is None:
+                continue  # skip malformed lines, never stall on them
+            ts, category, vip_name, verdict = parsed
+            hour = ts // HOUR_US
+            cols = pending.get(hour)
+            if cols is None:
+                cols = pending[hour] = {name: array(code) for name, code in COLUMNS.items()}
+            cols["ts"].append(ts)
+            cols["cat"].append(self._category_code(category))
+            cols["vip"].append(NO_VIP if vip_name is None else self._code(self._vip_codes, vip_name))
+            cols["verdict"].append(verdict)
+            cols["pos"].append(start)
+        if not pending:
+            return 0
+
+        # load every rollup this batch touches while the row counts still
+        # match what is on disk
+        if self._dirty_summary is None:
+            day_flat, _, hour_flat, _ = self._summary_view()
+            self._dirty_summary = (_to_counts(day_flat, 4), _to_counts(hour_flat, 4))
+        for hour in pending:
+            if hour not in self._dirty:
+                if self._rows.get(hour):
+                    hour_vip, _, minute_vip, _, minute_tot, _ = self._rollup(hour, minutes=True)
+                    self._dirty[hour] = (_to_counts(hour_vip, 4), _to_counts(minute_vip, 5),
+                                         _to_counts(minute_tot, 4))
+                else:
+                    self._dirty[hour] = ({}, {}, {})
+            day = hour // 24
+            if day not in self._dirty_days:
+                self._dirty_days[day] = _to_counts(self._day(day)[0], 4) if self._day_rows.get(day) else {}
+
+        day_counts, hour_counts = self._dirty_summary
+        for hour, cols in pending.items():
+            rows = self._rows.get(hour, 0)
+            os.makedirs(self._part_dir(hour), exist_ok=True)
+            for name, col in cols.items():
+                with open(self._column_path(hour, name), "ab") as f:
+                    # drop rows left behind by an interrupted update
+                    f.truncate(rows * col.itemsize)
+                    col.tofile(f)
+            counts = self._dirty[hour]
+            _count_rows(counts, cols["ts"], cols["cat"], cols["vip"], cols["verdict"])
+            day = hour // 24
+            day_vip = self._dirty_days[day]
+            for v, c, d in zip(cols["vip"], cols["cat"], cols["verdict"]):
+                _add(day_vip, (v, c, d))
+                _add(day_counts, (day, c, d))
+                _add(hour_counts, (hour, c, d))
+            self._rows[hour] = rows + len(cols["ts"])
+            _add(self._day_rows, day, len(cols["ts"]))
+            self._rollups.pop(hour, None)
+            self._days.pop(day, None)
+        self._summary = None
+        self._hours = sorted(self._rows)
+        return sum(len(cols["ts"]) for cols in pending.values())
+
+    # ---------- queries ----------
+    def _filter(self, category=None, vip=None, verdict=None):
+        """Translates user filters to codes. Returns None if nothing can match."""
+        codes = {}
+        if category is not None:
+            if category not in self._cat_codes:
+                return None
+            codes["cat"] = self._cat_codes[category]
+        if vip is not None:
+            vip = vip.lower()
+            if vip not in self._vip_codes:
+                return None
+            codes["vip"] = self._vip_codes[vip]
+        if verdict is not None:
+            codes["verdict"] = int(bool(verdict)) if isinstance(verdict, bool) else int(verdict)
+        return codes
+
+    def _segments(self, since, until):
+        """
+        Splits [since, until) into ("day", day), ("hour", hour) and
+        ("part", hour) pieces, covering only partitions that hold data.
+        """
+        hours = self._hours
+        i = 0 if since is None else bisect_left(hours, since // HOUR_US)
+        end = len(hours) if until is None else bisect_left(hours, -(-until // HOUR_US))
+        while i < end:
+            hour = hours[i]
+            start = hour * HOUR_US
+            if not ((since is None or since <= start) and (until is None or start + HOUR_US <= until)):
+                yield "part", hour
+                i += 1
+                continue
+            day = hour // 24
+            if (since is None or since <= day * DAY_US) and (until is None or (day + 1) * DAY_US <= until):
+                yield "day", day
+                i = bisect_left(hours, (day + 1) * 24, i, end)
+            else:
+                yield "hour", hour
+                i += 1
+
+    def _day_count(self, day, codes):
+        vip = codes.get("vip")
+        if vip is None:
+            flat, keys, _, _ = self._summary_view()
+            return _sum(flat, *_key_range(keys, day), 4, 1, codes)
+        flat, keys = self._day(day)
+        return _sum(flat, *_key_range(keys, vip), 4, 1, codes)
+
+    def _hour_count(self, hour, codes):
+        vip = codes.get("vip")
+        if vip is None:
+            _, _, flat, keys = self._summary_view()
+            return _sum(flat, *_key_range(keys, hour), 4, 1, codes)
+        flat, keys = self._rollup(hour)[:2]
+        return _sum(flat, *_key_range(keys, vip), 4, 1, codes)
+
+    def _minute_counts(self, hour, codes, since, until):
+        """Yields (minute_start_us, n) for matching minute rollups inside [since, until)."""
+        cat, vip, verdict = codes.get("cat"), codes.get("vip"), codes.get("verdict")
+        rollup = self._rollup(hour, minutes=True)
+        base = hour * HOUR_US
+        if vip is None:
+            flat, keys, width = rollup[4], rollup[5], 4
+            lo, hi = 0, len(keys)
+        else:
+            flat, keys, width = rollup[2], rollup[3], 5
+            lo, hi = _key_range(keys, vip)
+        at = width - 4   # position of the minute in each tuple
+        for j in range(lo * width, hi * width, width):
+            t = base + flat[j + at] * MINUTE_US
+            if ((cat is None or flat[j + at + 1] == cat) and (verdict is None or flat[j + at + 2] == verdict)
+                    and (since is None or t >= since) and (until is None or t < until)):
+                yield t, flat[j + width - 1]
+
+    def _scan(self, hour, codes, since, until):
+        """Yields (row, ts) for matching rows of one partition."""
+        ts = self._read_column(hour, "ts")
+        cols = [(self._read_column(hour, name), code) for name, code in codes.items()]
+        for row, t in enumerate(ts):
+            if since is not None and t < since:
+                continue
+            if until is not None and t >= until:
+                continue
+            if all(col[row] == code for col, code in cols):
+                yield row, t
+
+    def count(self, category=None, vip=None, verdict=None, since=None, until=None):
+        codes = self._filter(category, vip, verdict)
+        if codes is None:
+            return 0
+        since, until = to_us(since), to_us(until)
+        by_minute = _minute_aligned(since) and _minute_aligned(until)
+        total = 0
+        for kind, unit in self._segments(since, until):
+            if kind == "day":
+                total += self._day_count(unit, codes)
+            elif kind == "hour":
+                total += self._hour_count(unit, codes)
+            elif not self._hour_count(unit, codes):
+                continue
+            elif by_minute:
+                total += sum(n for _, n in self._minute_counts(unit, codes, since, until))
+            else:
+                total += sum(1 for _ in self._scan(unit, codes, since, until))
+        return total
+
+    def histogram(self, bucket=3600, category=None, vip=None, verdict=None, since=None, until=None):
+        """
+        Returns [(bucket_start_datetime, count), ...] for non-empty buckets.
+        bucket is in seconds. Whole days, hours and minutes are served from the
+        rollups; other bucket sizes, or bounds with seconds, scan every row in
+        range and are slow over large ranges.
+        """
+        codes = self._filter(category, vip, verdict)
+        if codes is None:
+            return []
+        since, until = to_us(since), to_us(until)
+        bucket_us = int(bucket * 1_000_000)
+        if bucket_us <= 0:
+            raise ValueError("bucket must be positive")
+        by_minute = (bucket_us % MINUTE_US == 0
+                     and _minute_aligned(since) and _minute_aligned(until))
+        counts = {}
+
+        def add(t, n):
+            if n:
+                _add(counts, t // bucket_us, n)
+
+        def hour_piece(hour, lo, hi):
+            if lo is None and hi is None and bucket_us % HOUR_US == 0:
+                add(hour * HOUR_US, self._hour_count(hour, codes))
+            elif not self._hour_count(hour, codes):
+                return
+            elif by_minute:
+                for t, n in self._minute_counts(hour, codes, lo, hi):
+                    add(t, n)
+            else:
+                for _, t in self._scan(hour, codes, lo, hi):
+                    add(t, 1)
+
+        for kind, unit in self._segments(since, until):
+            if kind == "day" and bucket_us % DAY_US == 0:
+                add(unit * DAY_US, self._day_count(unit, codes))
+            elif kind == "day":
+                if self._day_count(unit, codes):
+                    for hour in self._day_hours(unit):
+                        hour_piece(hour, None, None)
+            elif kind == "hour":
+                hour_piece(unit, None, None)
+            else:
+                hour_piece(unit, since, until)
+        return [(from_us(key * bucket_us), counts[key]) for key in sorted(counts)]
+
+    def records(self, category=None, vip=None, verdict=None, since=None, until=None,
+                page=1, page_size=50):
+        """Returns one page of matching log records, oldest partition first."""
+        if page < 1 or page_size < 1:
+            raise ValueError("page and page_size must be >= 1")
+        codes = self._filter(category, vip, verdict)
+        if codes is None:
+            return []
+        since, until = to_us(since), to_us(until)
+        skip = (page - 1) * page_size
+        positions = []
+
+        def pieces():
+            for kind, unit in self._segments(since, until):
+                if kind == "day":
+                    n = self._day_count(unit, codes)
+                    if n and skip_whole(n):
+                        continue
+                    hours = self._day_hours(unit) if n else []
+                    for hour in hours:
+                        yield hour, True
+                else:
+                    yield unit, kind == "hour"
+
+        def skip_whole(n):
+            nonlocal skip
+            if skip >= n:
+                skip -= n  # whole piece is before the requested page
+                return True
+            return False
+
+        for hour, full in pieces():
+            n = self._hour_count(hour, codes)
+            if not n or (full and skip_whole(n)):
+                continue
+            pos = None
+            for row, _ in self._scan(hour, codes, since, until):
+                if skip:
+                    skip -= 1
+                    continue
+                if pos is None:
+                    pos = self._read_column(hour, "pos")
+                positions.append(pos[row])
+                if len(positions) == page_size:
+                    break
+            if len(positions) == page_size:
+                break
+
+        out = []
+        with open(self.log_path, "rb") as log:
+            for p in positions:
+                log.seek(p)
+                out.append(json.loads(log.readline()))
+        return out
+
+
+def _count_rows(counts, ts, cats, vips, verdicts):
+    hour_vip, minute_vip, minute_tot = counts
+    for t, c, v, d in zip(ts, cats, vips, verdicts):
+        minute = (t % HOUR_US) // MINUTE_US
+        _add(hour_vip, (v, c, d))
+        _add(minute_vip, (v, minute, c, d))
+        _add(minute_tot, (minute, c, d))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the detection audit log")
+    parser.add_argument("--log", default=LOG_PATH)
+    parser.add_argument("--index", default=INDEX_DIR)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    sub.add_parser("ingest", help="index records appended since the last run")
+    sub.add_parser("rebuild", help="drop the index and re-ingest the whole log")
+
+    def add_filters(p):
+        p.add_argument("--category")
+        p.add_argument("--vip")
+        p.add_argument("--verdict", type=int, choices=[0, 1])
+        p.add_argument("--since", help="ISO-8601 start (inclusive)")
+        p.add_argument("--until", help="ISO-8601 end (exclusive)")
+
+    add_filters(sub.add_parser("count", help="number of matching records"))
+    p_hist = sub.add_parser("histogram", help="matching records per time bucket")
+    add_filters(p_hist)
+    p_hist.add_argument("--bucket", type=int, default=3600,
+                        help="bucket size in seconds, a multiple of 60 (served from the rollups)")
+    p_rec = sub.add_parser("records", help="page through matching records")
+    add_filters(p_rec)
+    p_rec.add_argument("--page", type=int, default=1)
+    p_rec.add_argument("--page-size", type=int, default=50)
+
+    args = parser.parse_args(argv)
+    if args.cmd == "histogram" and (args.bucket <= 0 or args.bucket % 60):
+        parser.error("--bucket must be a positive multiple of 60; finer buckets scan every row")
+    index = DetectionLogIndex(args.log, args.index)
+
+    if args.cmd == "rebuild":
+        index.reset()
+    added = index.update()
+    if args.cmd in ("ingest", "rebuild"):
+        print(f"Indexed {added} new records (offset {index.meta['offset']})")
+        return
+
+    filters = dict(category=args.category, vip=args.vip, verdict=args.verdict,
+                   since=args.since, until=args.until)
+    if args.cmd == "count":
+        print(index.count(**filters))
+    elif args.cmd == "histogram":
+        for start, n in index.histogram(bucket=args.bucket, **filters):
+            print(f"{start.isoformat()}\t{n}")
+    elif args.cmd == "records":
+        for record in index.records(page=args.page, page_size=args.page_size, **filters):
+            json.dump(record, sys.stdout)
+            sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
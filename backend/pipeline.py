@@ -1,21 +1,201 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
 from backend.threat_detector import ThreatDetector
 from backend.impersonation import ImpersonationDetector
-from backend.fake_detector import AccountVerifier   # changed
+from backend.fake_detector import AccountVerifier, FakeAccountModel   # changed
+
+VIP_AVATAR_DIR = os.path.join("data", "vip_avatars")
+
+# Weights used to fuse the individual signals into one risk score.
+# Signals that are missing (skipped, failed or past the deadline) are left out
+# and the remaining weights are renormalised.
+SIGNAL_WEIGHTS = {
+    "username": 0.3,
+    "account": 0.3,
+    "avatar": 0.2,
+    "posts": 0.2,
+}
 
 class VIPDetectionPipeline:
-    def __init__(self, official_usernames=None):
+    def __init__(self, official_usernames=None, max_inflight=32, vip_avatar_dir=VIP_AVATAR_DIR):
         self.threat_detector = ThreatDetector()
         self.account_verifier = AccountVerifier()   # changed
+        self.account_model = FakeAccountModel()
         self.impersonation_detector = ImpersonationDetector(official_usernames)
+        self.vip_avatar_dir = vip_avatar_dir
+        # checks still running across all assess() calls, including ones whose
+        # request already hit its deadline
+        self.max_inflight = max_inflight
+        self._inflight = 0
+        self._inflight_lock = threading.Lock()
 
     def check_text(self, text):
         return self.threat_detector.predict(text)
 
+    def check_texts(self, texts):
+        return self.threat_detector.predict_batch(texts)
+
     def check_account(self, account_dict):
         return self.account_verifier.verify(account_dict)   # changed
 
+    def check_account_features(self, feature_dict):
+        return self.account_model.predict(feature_dict)
+
     def check_username(self, username):
         return self.impersonation_detector.check_username(username)
 
     def check_profile_pic(self, vip_img, sus_img):
         return self.impersonation_detector.check_profile_pic(vip_img, sus_img)
+
+    def _vip_avatar(self, vip_name):
+        if not vip_name:
+            return None
+        for ext in (".jpg", ".jpeg", ".png"):
+            path = os.path.join(self.vip_avatar_dir, vip_name + ext)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _check_avatar(self, username_future, avatar, vip_avatar):
+        if vip_avatar is None:
+            # compare against the reference picture of the closest VIP,
+            # reusing the username signal instead of scanning the VIPs again
+            vip_name = username_future.result()["closest_match"][0]
+            vip_avatar = self._vip_avatar(vip_name)
+            if vip_avatar is None:
+                return {"skipped": f"no reference avatar for {vip_name!r}"}
+        return self.check_profile_pic(vip_avatar, avatar)
+
+    def _check_posts(self, posts):
+        results = self.check_texts(posts)
+        return {"results": results, "threats": sum(r["is_threat"] for r in results)}
+
+    def _tracked(self, fn):
+        def run(*args):
+            try:
+                return fn(*args)
+            finally:
+                with self._inflight_lock:
+                    self._inflight -= 1
+        return run
+
+    def _reserve(self, n):
+        """Claims up to n in-flight slots and returns how many were granted."""
+        with self._inflight_lock:
+            granted = max(0, min(n, self.max_inflight - self._inflight))
+            self._inflight += granted
+        return granted
+
+    def assess(self, handle, features=None, avatar=None, posts=None, vip_avatar=None, deadline=2.0):
+        """
+        Runs every available signal for one account concurrently and fuses them
+        into a single risk score in [0, 1].
+
+        - handle: username to compare against the official VIP list
+        - features: profile feature dict for the fake account model
+        - avatar / vip_avatar: image path or file-like object; without
+          vip_avatar the closest VIP's picture in vip_avatar_dir is used,
+          and the signal is skipped when there is none
+        - posts: list of recent post texts, scored in one batch
+        - deadline: seconds to wait; signals not finished by then are
+          reported in "missing" and the score uses whatever completed
+
+        Each call gets its own threads, so a slow request never delays
+        another one. Checks that miss the deadline cannot be stopped and keep
+        running; at most max_inflight checks run at once across all calls,
+        and signals that find no free slot come back as skipped. When no
+        signal carries evidence, risk_score and is_suspicious are None and
+        insufficient_evidence is set.
+        """
+        handle = (handle or "").strip()
+        signals = {}
+        tasks = {}
+        if handle:
+            tasks["username"] = (self.check_username, handle)
+        if features:
+            tasks["account"] = (self.check_account_features, features)
+        if avatar is not None and not handle and vip_avatar is None:
+            # without a handle there is no closest VIP to compare against
+            signals["avatar"] = {"skipped": "no handle or vip_avatar to compare against"}
+        elif avatar is not None:
+            tasks["avatar"] = (self._check_avatar, None, avatar, vip_avatar)
+        if posts:
+            tasks["posts"] = (self._check_posts, list(posts))
+
+        granted = self._reserve(len(tasks))
+        # avatar may wait on username, so avatar is dropped first and username last
+        drop_order = sorted(tasks, key=lambda n: (n != "avatar", n == "username"))
+        for name in drop_order[:len(tasks) - granted]:
+            signals[name] = {"skipped": "too many checks in flight"}
+            del tasks[name]
+
+        futures = {}
+        if tasks:
+            executor = ThreadPoolExecutor(max_workers=len(tasks))
+            try:
+                username = None
+                if "username" in tasks:
+                    username = executor.submit(self._tracked(self.check_username), handle)
+                    futures[username] = "username"
+                for name, (fn, *args) in tasks.items():
+                    if name == "username":
+                        continue
+                    if name == "avatar":
+                        args[0] = username
+                    futures[executor.submit(self._tracked(fn), *args)] = name
+            finally:
+                executor.shutdown(wait=False)   # overrunning checks finish in the background
+        done, not_done = wait(futures, timeout=deadline)
+
+        for fut in done:
+            name = futures[fut]
+            try:
+                signals[name] = fut.result()
+            except Exception as e:
+                signals[name] = {"error": str(e)}
+        missing = sorted(futures[fut] for fut in not_done)
+
+        risks = {}
+        for name, result in signals.items():
+            risk = _signal_risk(name, result, handle)
+            if risk is not None:
+                risks[name] = risk
+                result["risk"] = risk
+
+        total = sum(SIGNAL_WEIGHTS[name] for name in risks)
+        score = sum(SIGNAL_WEIGHTS[name] * r for name, r in risks.items()) / total if total else None
+
+        return {
+            "handle": handle,
+            "risk_score": score,
+            "is_suspicious": None if score is None else bool(score >= 0.5),
+            "insufficient_evidence": score is None,
+            "signals": signals,
+            "missing": missing,
+            "partial": bool(missing),
+        }
+
+
+def _signal_risk(name, result, handle):
+    """Maps one signal's result to a risk in [0, 1], or None if it carries no evidence."""
+    if "error" in result or "skipped" in result:
+        return None
+    if name == "username":
+        vip, similarity = result["closest_match"]
+        if vip is None or handle.lower() == str(vip).lower():
+            return 0.0   # exact handle of an official account
+        return float(similarity) if result["is_impersonation"] else 0.0
+    if name == "account":
+        return float(result["probability"])
+    if name == "avatar":
+        # phash is 64 bits; identical pictures score 1.0
+        return max(0.0, 1 - result["distance"] / 64) if result["is_impersonation"] else 0.0
+    if name == "posts":
+        if not result["results"]:
+            return None
+        # a keyword hit is treated as certain, like ThreatDetector's final label
+        return max((1.0 if r["keyword_hit"] else r["probability"]) if r["is_threat"] else 0.0
+                   for r in result["results"])
+    return None
@@ -0,0 +1,320 @@
+import os
+import sys
+import csv
+import mmap
+import math
+import struct
+import zlib
+import argparse
+from array import array
+
+BASE_DIR = os.path.join(os.path.dirname(__file__), "..")
+DATA_PATH = os.path.join(BASE_DIR, "data", "real_vip_accounts.csv")
+
+MAGIC = b"VIPROST2"
+# magic, rows, strings, hash slots, then byte offsets of every section
+HEADER = struct.Struct("<8sIII" + "Q" * 11)
+
+# CSV column -> roster attribute, parsed once at build time
+METRIC_COLUMNS = {
+    "Followers": "followers",
+    "Authentic Engagement": "authentic_engagement",
+    "Engagement Avg.": "engagement_avg",
+}
+STRING_COLUMNS = {
+    "Name": "name",
+    "Category": "category",
+    "Audience Country": "country",
+}
+
+# every CSV column the roster serves, in file order
+COLUMNS = ["Name", "Rank", "Category", "Followers", "Audience Country",
+           "Authentic Engagement", "Engagement Avg."]
+
+SUFFIXES = {"K": 1e3, "M": 1e6, "B": 1e9}
+MISSING_RANK = -1
+
+if sys.byteorder != "little":
+    raise ImportError("VIP roster files are little-endian and are mapped without conversion")
+
+
+def parse_metric(value):
+    """Parses counts like "462.9M", "850K" or "1234" into a float (NaN when empty)."""
+    value = (value or "").strip().replace(",", "")
+    if not value:
+        return math.nan
+    scale = SUFFIXES.get(value[-1].upper())
+    if scale is not None:
+        return float(value[:-1]) * scale
+    return float(value)
+
+
+def _metric_or_nan(value):
+    try:
+        return parse_metric(value)
+    except ValueError:
+        return math.nan
+
+
+def _rank_or_missing(value):
+    try:
+        return int((value or "").strip())
+    except ValueError:
+        return MISSING_RANK
+
+
+def _hash(key):
+    return zlib.crc32(key)
+
+
+def _slot_count(rows):
+    size = 1
+    while size < rows * 2:
+        size <<= 1
+    return size
+
+
+def build_roster(csv_path=DATA_PATH, out_path=None):
+    """
+    Parses the VIP CSV into a memory-mappable roster file and returns its path.
+
+    Layout: numeric columns (float64 metrics, int32 rank), string-id columns
+    pointing into one interned string table, and an open-addressing hash table
+    mapping names to their first row. Cells that do not parse ("N/A", "-", ...)
+    are stored as NaN for metrics and MISSING_RANK (-1) for the rank, so one
+    bad row never stops the roster from building.
+    """
+    out_path = out_path or os.path.splitext(csv_path)[0] + ".roster"
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"VIP dataset not found at {csv_path}")
+
+    strings, string_ids = [], {}
+
+    def intern(value):
+        value = (value or "").strip()
+        sid = string_ids.get(value)
+        if sid is None:
+            sid = string_ids[value] = len(strings)
+            strings.append(value)
+        return sid
+
+    ranks = array("i")
+    metrics = {attr: array("d") for attr in METRIC_COLUMNS.values()}
+    str_cols = {attr: array("I") for attr in STRING_COLUMNS.values()}
+    lower_name = array("I")   # lowercase handles for the impersonation scan
+    with open(csv_path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        missing = [c for c in COLUMNS if c not in reader.fieldnames]
+        if missing:
+            raise ValueError(f"VIP dataset is missing columns: {missing}")
+        for row in reader:
+            ranks.append(_rank_or_missing(row["Rank"]))
+            for col, attr in METRIC_COLUMNS.items():
+                metrics[attr].append(_metric_or_nan(row[col]))
+            for col, attr in STRING_COLUMNS.items():
+                str_cols[attr].append(intern(row[col]))
+            lower_name.append(intern((row["Name"] or "").lower()))
+    rows = len(ranks)
+
+    blob = bytearray()
+    str_offsets = array("I", [0])
+    for s in strings:
+        blob += s.encode("utf-8")
+        str_offsets.append(len(blob))
+
+    slots = _slot_count(rows)
+    mask = slots - 1
+    table = array("I", bytes(4 * slots))   # row + 1, 0 = empty
+    seen = set()
+    for row, sid in enumerate(str_cols["name"]):
+        if sid in seen:
+            continue   # duplicate name, first row wins
+        seen.add(sid)
+        i = _hash(strings[sid].encode("utf-8")) & mask
+        while table[i]:
+            i = (i + 1) & mask
+        table[i] = row + 1
+
+    # float64 sections first so every section stays naturally aligned
+    sections = [metrics[a] for a in METRIC_COLUMNS.values()]
+    sections += [ranks] + [str_cols[a] for a in STRING_COLUMNS.values()] + [lower_name]
+    sections += [table, str_offsets, blob]
+    offsets, pos = [], HEADER.size
+    for sec in sections:
+        pos = (pos + 7) & ~7
+        offsets.append(pos)
+        pos += len(sec) * (sec.itemsize if isinstance(sec, array) else 1)
+
+    tmp = out_path + f".tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, rows, len(strings), slots, *offsets))
+        for off, sec in zip(offsets, sections):
+            f.write(b"\0" * (off - f.tell()))
+            f.write(sec.tobytes() if isinstance(sec, array) else bytes(sec))
+    os.replace(tmp, out_path)   # readers never see a half-written file
+    return out_path
+
+
+class VIPRoster:
+    """
+    Read-only view over a roster file. Columns are memoryviews on a shared
+    mmap, so every worker process maps the same page-cache pages instead of
+    holding its own copy.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = memoryview(self._mm)
+        if len(buf) < HEADER.size:
+            raise ValueError(f"Truncated VIP roster file: {path}")
+        magic, self.rows, n_strings, slots, *offsets = HEADER.unpack_from(buf)
+        if magic != MAGIC:
+            raise ValueError(f"Not a VIP roster file: {path}")
+        self.path = path
+        self.columns = COLUMNS
+        n = self.rows
+
+        def col(off, fmt, count):
+            end = off + count * struct.calcsize(fmt)
+            if end > len(buf):
+                raise ValueError(f"Truncated VIP roster file: {path}")
+            return buf[off:end].cast(fmt)
+
+        names = list(METRIC_COLUMNS.values())
+        for attr, off in zip(names, offsets[:3]):
+            setattr(self, attr, col(off, "d", n))
+        self.rank = col(offsets[3], "i", n)
+        for attr, off in zip(STRING_COLUMNS.values(), offsets[4:7]):
+            setattr(self, attr + "_id", col(off, "I", n))
+        self.lower_name_id = col(offsets[7], "I", n)
+        self._table = col(offsets[8], "I", slots)
+        self._str_offsets = col(offsets[9], "I", n_strings + 1)
+        self._blob = col(offsets[10], "B", self._str_offsets[n_strings])
+        self._mask = slots - 1
+
+    def __len__(self):
+        return self.rows
+
+    def string(self, sid):
+        return bytes(self._blob[self._str_offsets[sid]:self._str_offsets[sid + 1]]).decode("utf-8")
+
+    def _string_bytes(self, sid):
+        return self._blob[self._str_offsets[sid]:self._str_offsets[sid + 1]]
+
+    def lookup(self, name):
+        """Returns the (first) row for an exact name, or None."""
+        if not name:
+            return None
+        key = str(name).encode("utf-8")
+        i = _hash(key) & self._mask
+        while True:
+            slot = self._table[i]
+            if not slot:
+                return None
+            if self._string_bytes(self.name_id[slot - 1]) == key:
+                return slot - 1
+            i = (i + 1) & self._mask
+
+    def __contains__(self, name):
+        return self.lookup(name) is not None
+
+    def name(self, row):
+        return self.string(self.name_id[row])
+
+    def names(self):
+        return [self.name(row) for row in range(self.rows)]
+
+    def iter_lower_names(self):
+        """Yields every lowercase name, decoding from the mapped file as it goes."""
+        for sid in self.lower_name_id:
+            yield self.string(sid)
+
+    def contains(self, column, value):
+        """
+        True if any row has this value in a CSV column. Name uses the hash
+        table; other columns are a linear scan over their parsed values.
+        """
+        if column == "Name":
+            return value in self
+        if column == "Rank":
+            try:
+                return int(value) in self.rank
+            except (TypeError, ValueError):
+                return False
+        if column in METRIC_COLUMNS:
+            try:
+                target = value if isinstance(value, (int, float)) else parse_metric(str(value))
+            except ValueError:
+                return False
+            return target in getattr(self, METRIC_COLUMNS[column])
+        if column in STRING_COLUMNS:
+            key = str(value).strip().encode("utf-8")
+            sids = {sid for sid in range(len(self._str_offsets) - 1) if self._string_bytes(sid) == key}
+            return any(sid in sids for sid in getattr(self, STRING_COLUMNS[column] + "_id"))
+        raise ValueError(f"VIP dataset must contain column '{column}'")
+
+    def record(self, row):
+        return {
+            "Name": self.name(row),
+            "Rank": self.rank[row],
+            "Category": self.string(self.category_id[row]),
+            "Audience Country": self.string(self.country_id[row]),
+            "Followers": self.followers[row],
+            "Authentic Engagement": self.authentic_engagement[row],
+            "Engagement Avg.": self.engagement_avg[row],
+        }
+
+
+_OPEN = {}
+
+
+def load_roster(csv_path=DATA_PATH, roster_path=None):
+    """
+    Returns the process-wide roster for a CSV, (re)building the binary file
+    only when it is missing or older than the CSV.
+    """
+    roster_path = roster_path or os.path.splitext(csv_path)[0] + ".roster"
+    key = os.path.abspath(roster_path)
+    roster = _OPEN.get(key)
+    if roster is not None:
+        return roster
+    stale = (not os.path.exists(roster_path)
+             or (os.path.exists(csv_path) and os.path.getmtime(csv_path) > os.path.getmtime(roster_path)))
+    if stale:
+        build_roster(csv_path, roster_path)
+    try:
+        roster = VIPRoster(roster_path)
+    except (ValueError, struct.error):
+        # empty, truncated or written by an older layout
+        build_roster(csv_path, roster_path)
+        roster = VIPRoster(roster_path)
+    _OPEN[key] = roster
+    return roster
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or inspect the binary VIP roster")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_build = sub.add_parser("build", help="parse the CSV into a .roster file")
+    p_build.add_argument("csv", nargs="?", default=DATA_PATH)
+    p_build.add_argument("-o", "--out")
+    p_show = sub.add_parser("show", help="print the record for a VIP name")
+    p_show.add_argument("name")
+    p_show.add_argument("--csv", default=DATA_PATH)
+    args = parser.parse_args(argv)
+
+    if args.cmd == "build":
+        path = build_roster(args.csv, args.out)
+        print(f"✅ Wrote {len(VIPRoster(path))} VIPs to {path}")
+    else:
+        roster = load_roster(args.csv)
+        row = roster.lookup(args.name)
+        if row is None:
+            print(f"❌ {args.name} is not in the roster")
+        else:
+            print(roster.record(row))
+
+
+if __name__ == "__main__":
+    main()
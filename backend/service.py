@@ -1,7 +1,10 @@
 # D:\Hackathon\backend\service.py
 import os
-import pandas as pd
+import io
+import math
+import base64
 from backend.pipeline import VIPDetectionPipeline
+from backend.roster import load_roster
 
 # Path to your real dataset
 DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "real_vip_accounts.csv")
@@ -9,12 +12,12 @@ DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "real_vip_acco
 if not os.path.exists(DATA_PATH):
     raise FileNotFoundError(f"VIP dataset not found at {DATA_PATH}")
 
-# Load VIP names from dataset
-df = pd.read_csv(DATA_PATH)
-OFFICIAL_VIPS = df["Name"].dropna().astype(str).str.lower().tolist()
+# Shared binary roster (built from the CSV on first use); its lowercase names
+# are read straight from the mmap, so no per-worker copy of the VIP list
+roster = load_roster(DATA_PATH)
 
 # Initialize pipeline with official names
-pipeline = VIPDetectionPipeline(official_usernames=OFFICIAL_VIPS)
+pipeline = VIPDetectionPipeline(official_usernames=roster)
 
 def check_text_service(text: str):
     return pipeline.check_text(text or "")
@@ -24,3 +27,41 @@ def check_account_service(name: str):
 
 def check_username_service(username: str):
     return pipeline.check_username((username or "").strip())
+
+def _decode_image(b64):
+    if b64 is None or b64 == "":
+        return None
+    if not isinstance(b64, str):
+        raise ValueError("images must be base64 strings")
+    if "," in b64 and b64.startswith("data:"):
+        b64 = b64.split(",", 1)[1]   # strip data-URL prefix sent by browsers
+    data = base64.b64decode(b64, validate=True)
+    if not data:
+        raise ValueError("image is empty")
+    return io.BytesIO(data)
+
+# server-side cap on how long one assessment may hold a request thread
+MAX_DEADLINE_MS = 10_000
+
+def _deadline_seconds(deadline_ms):
+    deadline_ms = float(deadline_ms)
+    if not math.isfinite(deadline_ms):
+        raise ValueError("deadline_ms must be a finite number")
+    return min(max(0.0, deadline_ms), MAX_DEADLINE_MS) / 1000
+
+def assess_account_service(username: str, features=None, avatar_b64=None, posts=None,
+                           vip_avatar_b64=None, deadline_ms=2000):
+    if username is not None and not isinstance(username, str):
+        raise ValueError("username must be a string")
+    if posts is not None and not isinstance(posts, list):
+        raise ValueError("posts must be a list of strings")
+    if features is not None and not isinstance(features, dict):
+        raise ValueError("features must be an object")
+    return pipeline.assess(
+        (username or "").strip(),
+        features=features or None,
+        avatar=_decode_image(avatar_b64),
+        posts=[str(p) for p in (posts or [])],
+        vip_avatar=_decode_image(vip_avatar_b64),
+        deadline=_deadline_seconds(deadline_ms),
+    )
@@ -19,26 +19,35 @@ class ThreatDetector:
         ]
 
     def predict(self, text: str, threshold: float = 0.6):
-        text = str(text or "").lower()
-        X = self.vec.transform([text])
+        return self.predict_batch([text], threshold)[0]
+
+    def predict_batch(self, texts, threshold: float = 0.6):
+        """Scores several texts with a single vectorizer/classifier pass."""
+        texts = [str(t or "").lower() for t in texts]
+        if not texts:
+            return []
+        X = self.vec.transform(texts)
 
         # Model prediction
         if hasattr(self.clf, "predict_proba"):
-            prob = float(self.clf.predict_proba(X)[0, 1])
+            probs = [float(p) for p in self.clf.predict_proba(X)[:, 1]]
         else:
-            score = float(self.clf.decision_function(X)[0])
-            prob = 1 / (1 + pow(2.718281828, -score))
+            scores = self.clf.decision_function(X)
+            probs = [1 / (1 + pow(2.718281828, -float(s))) for s in scores]
 
-        model_label = bool(prob >= threshold)
+        results = []
+        for text, prob in zip(texts, probs):
+            model_label = bool(prob >= threshold)
 
-        # Keyword-based fallback
-        keyword_hit = any(word in text for word in self.threat_keywords)
+            # Keyword-based fallback
+            keyword_hit = any(word in text for word in self.threat_keywords)
 
-        # Final decision: either ML OR keywords
-        final_label = model_label or keyword_hit
+            # Final decision: either ML OR keywords
+            final_label = model_label or keyword_hit
 
-        return {
-            "is_threat": final_label,
-            "probability": prob,
-            "keyword_hit": keyword_hit
-        }
+            results.append({
+                "is_threat": final_label,
+                "probability": prob,
+                "keyword_hit": keyword_hit
+            })
+        return results
@@ -0,0 +1,70 @@
+import base64
+
+from api.server import app
+from backend.service import pipeline
+
+SLOW_POSTS = ["I will kill the VIP tomorrow"] * 20000
+
+
+def assess(body):
+    resp = app.test_client().post("/api/assess-account", json=body)
+    return resp.status_code, resp.get_json()
+
+
+if __name__ == "__main__":
+    fake_account = {
+        "followers_count": 20,
+        "following_count": 2000,
+        "account_age_days": 5,
+        "post_count": 2,
+        "has_profile_pic": 0,
+        "has_bio": 0
+    }
+
+    print("=== Full assessment ===")
+    status, r = assess({"username": "leomess1", "features": fake_account,
+                        "posts": ["I will kill the VIP tomorrow"], "deadline_ms": 5000})
+    assert status == 200 and not r["partial"] and not r["insufficient_evidence"]
+    assert set(r["signals"]) == {"username", "account", "posts"}
+    assert 0.0 <= r["risk_score"] <= 1.0 and r["is_suspicious"]
+    print("✅ risk_score:", round(r["risk_score"], 3))
+
+    print("\n=== Deadline ===")
+    status, r = assess({"username": "leomess1", "posts": SLOW_POSTS, "deadline_ms": 0})
+    assert status == 200 and r["partial"] and "posts" in r["missing"]
+    assert "posts" not in r["signals"]
+    print("✅ missing:", r["missing"])
+
+    print("\n=== In-flight cap ===")
+    saved = pipeline.max_inflight
+    pipeline.max_inflight = 0
+    try:
+        status, r = assess({"username": "leomess1", "features": fake_account})
+    finally:
+        pipeline.max_inflight = saved
+    assert status == 200 and not r["missing"]
+    assert all("skipped" in sig for sig in r["signals"].values())
+    assert r["insufficient_evidence"] and r["risk_score"] is None
+    print("✅ all signals skipped:", sorted(r["signals"]))
+
+    print("\n=== No evidence ===")
+    status, r = assess({})
+    assert status == 200 and r["signals"] == {}
+    assert r["insufficient_evidence"] and r["risk_score"] is None and r["is_suspicious"] is None
+    status, r = assess({"avatar": base64.b64encode(b"not an image").decode()})
+    assert status == 200 and "skipped" in r["signals"]["avatar"] and r["insufficient_evidence"]
+    print("✅ empty request is not reported as clean")
+
+    print("\n=== Validation ===")
+    for body in [
+        {"username": "leomess1", "posts": "hello"},
+        {"username": "leomess1", "features": [1, 2]},
+        {"username": "leomess1", "avatar": "!!!"},
+        {"username": "leomess1", "vip_avatar": "abc"},
+        {"username": "leomess1", "deadline_ms": "inf"},
+        {"username": "leomess1", "deadline_ms": "soon"},
+        {"username": 42},
+    ]:
+        status, r = assess(body)
+        assert status == 400, (body, status, r)
+    print("✅ bad input rejected with 400")
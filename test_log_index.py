@@ -0,0 +1,151 @@
+import os
+import json
+import random
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+from backend.log_index import DetectionLogIndex
+
+
+def write(path, lines, mode="a"):
+    with open(path, mode, encoding="utf-8") as f:
+        f.write("".join(lines))
+
+
+def record(ts, username, vip, flagged):
+    return json.dumps({
+        "ts": ts,
+        "category": "username",
+        "input": {"username": username},
+        "result": {"closest_match": [vip, 0.9], "is_impersonation": flagged},
+    }) + "\n"
+
+
+if __name__ == "__main__":
+    tmp = tempfile.mkdtemp()
+    log_path = os.path.join(tmp, "detections.log")
+    index_dir = os.path.join(tmp, "index")
+
+    write(log_path, [
+        record("2025-09-03T15:14:47Z", "v1ratkohli", "viratkohli", True),
+        record("2025-09-03T15:40:00Z", "leomess1", "leomessi", True),
+        record("2025-09-03T16:05:00Z", "iamsrk", "iamsrk", False),
+    ], mode="w")
+
+    print("=== Initial ingest ===")
+    index = DetectionLogIndex(log_path, index_dir)
+    assert index.update() == 3
+    assert index.count() == 3
+    assert index.count(vip="leomessi", verdict=True) == 1
+    print("✅ 3 records indexed")
+
+    print("\n=== Resume from saved offset ===")
+    write(log_path, [record("2025-09-03T16:30:00Z", "leomesi", "leomessi", True)])
+    index = DetectionLogIndex(log_path, index_dir)
+    assert index.update() == 1
+    assert index.update() == 0
+    assert index.count(vip="leomessi") == 2
+    assert index.count(since="2025-09-03T15:30:00Z", until="2025-09-03T16:10:00Z") == 2
+    print("✅ only the appended record was read")
+
+    print("\n=== Trailing partial line ===")
+    partial = record("2025-09-03T17:00:00Z", "cristian0", "cristiano", True)
+    write(log_path, [partial[:20]])
+    assert index.update() == 0
+    write(log_path, [partial[20:]])
+    assert index.update() == 1
+    assert index.records(vip="cristiano")[0]["input"]["username"] == "cristian0"
+    print("✅ partial line waited for, then indexed once")
+
+    print("\n=== Paging and histograms ===")
+    page = index.records(verdict=True, page=2, page_size=2)
+    assert [r["input"]["username"] for r in page] == ["leomesi", "cristian0"]
+    hours = [n for _, n in index.histogram(bucket=3600)]
+    assert hours == [2, 2, 1]
+    assert len(index.histogram(bucket=60, since="2025-09-03T15:00:00Z", until="2025-09-03T16:00:00Z")) == 2
+    print("✅ pages and buckets match")
+
+    print("\n=== Interrupted update ===")
+    # columns written but the offset/row counts never committed
+    hour = max(index._rows)
+    with open(index._column_path(hour, "ts"), "ab") as f:
+        f.write(b"\0" * 8 * 3)
+    with open(os.path.join(index._part_dir(hour), "rollup.bin"), "wb") as f:
+        f.write(b"garbage")
+    index = DetectionLogIndex(log_path, index_dir)
+    assert index.count() == 5
+    write(log_path, [record("2025-09-03T17:10:00Z", "v1ratkohli", "viratkohli", True)])
+    assert index.update() == 1
+    assert index.count(vip="viratkohli") == 2
+    assert len(index.records(since="2025-09-03T17:00:00Z")) == 2
+    print("✅ stale rows dropped and rollup rebuilt")
+
+    print("\n=== Malformed lines ===")
+    offset = index.meta["offset"]
+    write(log_path, [
+        '{"ts": {"nested": 1}, "category": "text"}\n',
+        '{"ts": "2025-09-03T17:20:00Z", "category": "text", "result": [1, 2], "input": "x"}\n',
+        '{"ts": "2025-09-03T17:21:00Z", "category": "account", "input": ["Name"], "result": "fake"}\n',
+        '[1, 2, 3]\n',
+        '{"ts": 1e300, "category": "text"}\n',
+        'not json at all\n',
+    ])
+    write(log_path, [json.dumps({"ts": "2025-09-03T17:30:00Z", "category": f"cat{i}",
+                                 "result": {"is_threat": False}}) + "\n" for i in range(300)])
+    write(log_path, [
+        json.dumps({"ts": "2025-09-03T17:40:00Z", "category": "account",
+                    "input": {"Name": "random_user"}, "result": {"is_fake": True}}) + "\n",
+        json.dumps({"ts": "2025-09-03T17:41:00Z", "category": "account",
+                    "input": {"Name": "LeoMessi"}, "result": {"is_fake": False}}) + "\n",
+    ])
+    assert index.update() == 2 + 300 + 2
+    assert index.meta["offset"] == os.path.getsize(log_path) > offset
+    assert index.count(category="cat299") == 1
+    assert index.count(category="text") == 1
+    assert "random_user" not in index.meta["vips"]
+    assert index.count(vip="leomessi", category="account") == 1
+    print("✅ bad lines skipped, 300 categories stored, unverified names not indexed")
+
+    print("\n=== Rollups match a full scan ===")
+    rnd = random.Random(7)
+    start = datetime(2025, 10, 1, tzinfo=timezone.utc)
+    rows = []
+    for _ in range(3000):
+        ts = start + timedelta(seconds=rnd.randrange(3 * 86400))
+        rows.append((ts, rnd.choice(["text", "username", "account"]),
+                     rnd.choice(["a", "b", "c"]), rnd.random() < 0.4))
+    rows.sort()
+    write(log_path, [record(ts.isoformat().replace("+00:00", "Z"), "x", vip, flagged)
+                     for ts, _, vip, flagged in rows], mode="w")
+    index = DetectionLogIndex(log_path, os.path.join(tmp, "index2"))
+    assert index.update() == 3000
+    index = DetectionLogIndex(log_path, os.path.join(tmp, "index2"))
+    ranges = [(None, None), (start, start + timedelta(days=2)),
+              (start + timedelta(hours=5, minutes=17), start + timedelta(days=1, hours=3)),
+              (start + timedelta(hours=30, seconds=13), start + timedelta(hours=50, seconds=59))]
+    for since, until in ranges:
+        for vip, flagged in [(None, None), ("a", None), (None, True), ("b", False)]:
+            expected = [ts for ts, _, v, f in rows
+                        if (since is None or ts >= since) and (until is None or ts < until)
+                        and (vip is None or v == vip) and (flagged is None or f == flagged)]
+            args = dict(vip=vip, verdict=flagged, since=since, until=until)
+            assert index.count(**args) == len(expected), (args, index.count(**args), len(expected))
+            for bucket in (86400, 3600, 900):
+                naive = {}
+                for ts in expected:
+                    key = int(ts.timestamp()) // bucket * bucket
+                    naive[key] = naive.get(key, 0) + 1
+                got = {int(t.timestamp()): n for t, n in index.histogram(bucket=bucket, **args)}
+                assert got == naive, (args, bucket)
+            page = index.records(page=3, page_size=7, **args)
+            assert [r["ts"] for r in page] == [ts.isoformat().replace("+00:00", "Z")
+                                               for ts in expected[14:21]]
+    print("✅ counts, histograms and pages agree with a full scan")
+
+    print("\n=== Truncated log ===")
+    write(log_path, [record("2025-09-04T09:00:00Z", "iamsrk", "iamsrk", False)], mode="w")
+    index = DetectionLogIndex(log_path, index_dir)
+    assert index.update() == 1
+    assert index.count() == 1
+    assert [d for d in os.listdir(index_dir) if d[:1].isdigit()] == ["20250904T09"]
+    print("✅ index reset and old partitions removed")
@@ -0,0 +1,126 @@
+import os
+import csv
+import math
+import shutil
+import tempfile
+
+from backend import roster as roster_mod
+from backend.roster import VIPRoster, build_roster, load_roster, parse_metric
+from backend.fake_detector import AccountVerifier
+
+HEADER = ["Name", "Rank", "Category", "Followers", "Audience Country",
+          "Authentic Engagement", "Engagement Avg."]
+
+
+def write_csv(path, rows):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        writer.writerows(rows)
+
+
+def same(a, b):
+    return (math.isnan(a) and math.isnan(b)) or a == b
+
+
+if __name__ == "__main__":
+    tmp = tempfile.mkdtemp()
+    csv_path = os.path.join(tmp, "vips.csv")
+
+    print("=== parse_metric ===")
+    assert parse_metric("462.9M") == 462.9e6
+    assert parse_metric("850K") == 850e3
+    assert parse_metric("1.2B") == 1.2e9
+    assert parse_metric("0") == 0.0
+    assert parse_metric("1,234") == 1234.0
+    assert math.isnan(parse_metric(""))
+    print("✅ suffixes, plain numbers and empty cells")
+
+    print("\n=== Build and lookup ===")
+    rows = [
+        ["cristiano", "1", "Sports with a ball", "462.9M", "India", "5.5M", "6.6M"],
+        ["leomessi", "2", "Sports with a ballFamily", "347.2M", "Argentina", "3.6M", "4.8M"],
+        ["LeoMessi", "3", "Music", "1.5M", "Brazil", "850K", "900K"],
+        ["cristiano", "4", "Duplicate", "1M", "India", "1K", "1K"],
+        ["broken", "N/A", "-", "-", "", "1,2K", ""],
+        ["émilie", "6", "Art", "12", "France", "0", "7"],
+    ]
+    # enough extra names that several share a hash slot
+    rows += [[f"vip{i}", str(10 + i), f"Cat{i % 7}", f"{i}K", "India", f"{i}", f"{i}.5K"]
+             for i in range(2000)]
+    write_csv(csv_path, rows)
+    roster = VIPRoster(build_roster(csv_path))
+    assert len(roster) == len(rows)
+
+    with open(csv_path, encoding="utf-8", newline="") as f:
+        expected = list(csv.DictReader(f))
+    first_row = {}
+    for i, row in enumerate(expected):
+        first_row.setdefault(row["Name"], i)
+    for name, i in first_row.items():
+        assert roster.lookup(name) == i, name
+        rec, row = roster.record(i), expected[i]
+        assert rec["Name"] == row["Name"] and rec["Category"] == row["Category"]
+        for col in ("Followers", "Authentic Engagement", "Engagement Avg."):
+            try:
+                want = parse_metric(row[col])
+            except ValueError:
+                want = math.nan
+            assert same(rec[col], want), (name, col)
+    assert roster.lookup("cristiano") == 0          # duplicate, first row wins
+    assert roster.lookup("leomessi") != roster.lookup("LeoMessi")
+    assert roster.lookup("nobody") is None and "" not in roster
+    print("✅", len(first_row), "names resolve to their first row")
+
+    print("\n=== Unparseable cells ===")
+    broken = roster.record(roster.lookup("broken"))
+    assert broken["Rank"] == roster_mod.MISSING_RANK
+    assert math.isnan(broken["Followers"]) and math.isnan(broken["Engagement Avg."])
+    assert broken["Authentic Engagement"] == 12e3
+    print("✅ bad cells stored as NaN / -1")
+
+    print("\n=== Lowercase names ===")
+    lower = list(roster.iter_lower_names())
+    assert lower[:3] == ["cristiano", "leomessi", "leomessi"] and lower[5] == "émilie"
+    print("✅ lowercase handles served from the mapped file")
+
+    print("\n=== AccountVerifier on other columns ===")
+    verifier = AccountVerifier(csv_path)
+    assert not verifier.verify({"Name": "leomessi"})["is_fake"]
+    assert verifier.verify({"Name": "leomess1"})["is_fake"]
+    assert not verifier.verify({"Category": "Music"}, "Category")["is_fake"]
+    assert verifier.verify({"Category": "Cooking"}, "Category")["is_fake"]
+    assert not verifier.verify({"Audience Country": "Argentina"}, "Audience Country")["is_fake"]
+    assert not verifier.verify({"Rank": 2}, "Rank")["is_fake"]
+    assert not verifier.verify({"Followers": "462.9M"}, "Followers")["is_fake"]
+    assert verifier.verify({"Followers": "N/A"}, "Followers")["is_fake"]
+    try:
+        verifier.verify({"Age": 3}, "Age")
+        raise AssertionError("unknown column accepted")
+    except ValueError:
+        pass
+    print("✅ non-Name columns checked against parsed values")
+
+    print("\n=== Rebuilds ===")
+    roster_path = os.path.join(tmp, "cache.roster")
+    for content in [b"", b"VIPROST1" + b"\0" * 200, b"VIPROST2\0\0"]:
+        with open(roster_path, "wb") as f:
+            f.write(content)
+        os.utime(csv_path, (0, 0))   # roster file looks newer than the CSV
+        roster_mod._OPEN.clear()
+        assert load_roster(csv_path, roster_path).lookup("leomessi") == 1
+    # a full-size file whose sections are cut off
+    build_roster(csv_path, roster_path)
+    size = os.path.getsize(roster_path)
+    with open(roster_path, "r+b") as f:
+        f.truncate(size // 2)
+    roster_mod._OPEN.clear()
+    assert len(load_roster(csv_path, roster_path)) == len(rows)
+    # a CSV newer than the roster
+    write_csv(csv_path, rows[:2])
+    os.utime(csv_path, (os.path.getmtime(roster_path) + 10,) * 2)
+    roster_mod._OPEN.clear()
+    assert len(load_roster(csv_path, roster_path)) == 2
+    print("✅ empty, old-magic, truncated and stale files rebuilt")
+
+    shutil.rmtree(tmp)